@@ -7,9 +7,9 @@ from odf.opendocument import Element, OpenDocument, OpenDocumentText
 from odf.table import Table, TableColumn, TableRow, TableCell
 from odf.text import A, P, Span
 from tomlkit import TOMLDocument
-from typing import Any, TypeGuard, TypeVar
+from typing import Any, TypeVar
 
-from .styles import add_styles
+from .styles import add_styles, get_style
 
 T = TypeVar("T", str, Sequence[str], Mapping[str, str])
 Block = tuple[str, T]
@@ -18,51 +18,44 @@ ListBlock = Block[Sequence[str]]
 DictBlock = Block[Mapping[str, str]]
 
 
-def is_seq_of_str(o: Any) -> TypeGuard[Sequence[str]]:
-    return isinstance(o, Sequence) and all(isinstance(e, str) for e in o)
-
-
-def is_mapping_of_str_to_str(o: Any) -> TypeGuard[Mapping[str, str]]:
-    return isinstance(o, Mapping) and all(
-        isinstance(k, str) and isinstance(v, str) for k, v in o.items()
-    )
-
-
 class UnexpectedBlockType(Exception):
     def __init__(self, name: str, unexpected: type) -> None:
         super().__init__(f"unexpected shape of block {name}, got type {unexpected}")
 
 
+# element types are checked by the sections, while visiting them
 def get_blocks(config: TOMLDocument) -> Iterable[Block[Any]]:
     for block_name, v in config.unwrap().items():
-        if isinstance(v, str):
+        t = type(v)
+        if t is str:
             yield block_name, v
-        elif isinstance(v, dict):
-            if len(v) == 1 and "_" in v and is_seq_of_str(v["_"]):
+        elif t is dict:
+            if len(v) == 1 and "_" in v and type(v["_"]) in (list, str):
                 yield block_name, v["_"]
-            elif is_mapping_of_str_to_str(v):
-                yield block_name, v
             else:
-                raise UnexpectedBlockType(block_name, type(v))
+                yield block_name, v
         else:
-            raise UnexpectedBlockType(block_name, type(v))
+            raise UnexpectedBlockType(block_name, t)
 
 
-def get_header(doc: OpenDocument, config: TOMLDocument) -> Element:
+def get_header(doc: OpenDocument, config: TOMLDocument) -> Element | None:
     title = config.pop("title", None)
     subtitle = config.pop("subtitle").upper() if "subtitle" in config else None
     urls = config.pop("urls", {})
 
+    if title is None and subtitle is None and len(urls) == 0:
+        return None
+
     table = Table()
 
     table.addElement(
         TableColumn(
-            stylename=doc.getStyleByName("Table title"),
+            stylename=get_style(doc, "Table title"),
         )
     )
     table.addElement(
         TableColumn(
-            stylename=doc.getStyleByName("Table urls"),
+            stylename=get_style(doc, "Table urls"),
         )
     )
 
@@ -70,18 +63,18 @@ def get_header(doc: OpenDocument, config: TOMLDocument) -> Element:
     table.addElement(tr)
     tc = TableCell(
         valuetype="string",
-        numberrowsspanned=len(urls),
+        numberrowsspanned=max(len(urls), 1),
     )
     tr.addElement(tc)
     tc.addElement(
         P(
-            stylename=doc.getStyleByName("Title"),
+            stylename=get_style(doc, "Title"),
             text=title,
         )
     )
     tc.addElement(
         P(
-            stylename=doc.getStyleByName("Subtitle"),
+            stylename=get_style(doc, "Subtitle"),
             text=subtitle,
         )
     )
@@ -93,7 +86,7 @@ def get_header(doc: OpenDocument, config: TOMLDocument) -> Element:
         tc = TableCell(valuetype="string")
         tr.addElement(tc)
 
-        p = P(stylename=doc.getStyleByName("Urls"))
+        p = P(stylename=get_style(doc, "Urls"))
         tc.addElement(p)
         p.addElement(
             A(
@@ -116,7 +109,7 @@ def get_dict_section(doc: OpenDocument, block: DictBlock) -> Element:
         stylename = "Table column " + style
         table.addElement(
             TableColumn(
-                stylename=doc.getStyleByName(stylename),
+                stylename=get_style(doc, stylename),
             )
         )
 
@@ -128,13 +121,15 @@ def get_dict_section(doc: OpenDocument, block: DictBlock) -> Element:
     )
     tc.addElement(
         P(
-            stylename=doc.getStyleByName("Table header"),
+            stylename=get_style(doc, "Table header"),
             text="+ " + title.upper(),
         )
     )
     tr.addElement(tc)
 
     for key, value in values.items():
+        if not isinstance(value, str):
+            raise UnexpectedBlockType(title, type(value))
         tr = get_normal_row(doc, key, value)
         table.addElement(tr)
 
@@ -143,18 +138,17 @@ def get_dict_section(doc: OpenDocument, block: DictBlock) -> Element:
 
 def get_paragraph(doc: OpenDocument, style: Element, value: str) -> Element:
     p = P(stylename=style)
+    bold = get_style(doc, "Bold")
 
-    bold = False
-    for v in value.split("_"):
+    # odd parts are the ones between underscores
+    for i, v in enumerate(value.split("_")):
         part = Span(
-            stylename=doc.getStyleByName("Bold") if bold else None,
+            stylename=bold if i & 1 else None,
             text=v,
         )
 
         p.addElement(part)
 
-        bold = not bold
-
     return p
 
 
@@ -165,12 +159,13 @@ def get_normal_row(doc: OpenDocument, title: str, value: str) -> Element:
 
     tc_key.addElement(
         P(
-            stylename=doc.getStyleByName("Table key"),
+            stylename=get_style(doc, "Table key"),
             text=title,
         )
     )
+    value_style = get_style(doc, "Table value")
     for line in value.split("\n"):
-        p = get_paragraph(doc, doc.getStyleByName("Table value"), line)
+        p = get_paragraph(doc, value_style, line)
         tc_val.addElement(p)
 
     tr.addElement(tc_key)
@@ -187,7 +182,7 @@ def get_list_cell(doc: OpenDocument, line: str | None) -> Element:
     if line is not None:
         tc.addElement(
             P(
-                stylename=doc.getStyleByName("Table value"),
+                stylename=get_style(doc, "Table value"),
                 text=line,
             )
         )
@@ -203,7 +198,7 @@ def get_list_section(doc: OpenDocument, block: ListBlock) -> Element:
     for _ in range(2):
         table.addElement(
             TableColumn(
-                stylename=doc.getStyleByName("Table value"),
+                stylename=get_style(doc, "Table value"),
             )
         )
 
@@ -213,7 +208,7 @@ def get_list_section(doc: OpenDocument, block: ListBlock) -> Element:
     tc = TableCell(valuetype="string", numbercolumnsspanned=2)
     tc.addElement(
         P(
-            stylename=doc.getStyleByName("Table header"),
+            stylename=get_style(doc, "Table header"),
             text="+ " + title.upper(),
         )
     )
@@ -226,6 +221,8 @@ def get_list_section(doc: OpenDocument, block: ListBlock) -> Element:
         table.addElement(tr)
 
         for e in line:
+            if e is not None and not isinstance(e, str):
+                raise UnexpectedBlockType(title, type(e))
             cell = get_list_cell(doc, e)
             tr.addElement(cell)
 
@@ -244,7 +241,7 @@ def get_text_section(doc: OpenDocument, block: TextBlock) -> Element:
     )
     tc.addElement(
         P(
-            stylename=doc.getStyleByName("Table header"),
+            stylename=get_style(doc, "Table header"),
             text="+ " + title.upper(),
         )
     )
@@ -261,7 +258,12 @@ def generate(config: TOMLDocument) -> OpenDocument:
     doc = OpenDocumentText()
     add_styles(doc)
 
-    doc.text.addElement(get_header(doc, config))
+    if len(config) == 0:
+        return doc
+
+    header = get_header(doc, config)
+    if header is not None:
+        doc.text.addElement(header)
 
     for block in get_blocks(config):
         table = None
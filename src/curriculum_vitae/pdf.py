@@ -0,0 +1,348 @@
+import asyncio
+import atexit
+from asyncio.subprocess import Process, create_subprocess_exec
+from collections.abc import Awaitable, Callable
+from functools import cache
+from io import BytesIO
+from os import PathLike, environ, killpg, pipe
+from odf.opendocument import OpenDocument
+from pathlib import Path
+from pypdf import PdfReader, PdfWriter
+from shutil import copyfileobj
+from signal import SIGKILL, SIGTERM, Signals
+import socket
+from subprocess import DEVNULL, PIPE, CalledProcessError, Popen
+import sys
+from tempfile import TemporaryDirectory
+import time
+from typing import IO, TYPE_CHECKING, Any, Literal, TypeVar
+
+if TYPE_CHECKING:
+    from unoserver.client import UnoClient
+
+# from typeshed
+StrOrBytesPath = str | bytes | PathLike[str] | PathLike[bytes]
+
+T = TypeVar("T")
+
+Backend = Literal["libreoffice", "pandoc"]
+
+UNOSERVER_START_TIMEOUT = 30.0  # seconds
+TERMINATE_TIMEOUT = 2.0  # seconds
+SHM_PATH = Path("/dev/shm")
+
+
+class UnableToAutoDetectBackend(Exception):
+    def __init__(self) -> None:
+        super().__init__("unable to auto detect backend")
+
+
+class UnableToLoadDocument(Exception):
+    def __init__(self, server: str) -> None:
+        super().__init__(f"unable to load document in soffice at {server}")
+
+
+def signal_group(p: Process, sig: Signals) -> None:
+    try:
+        killpg(p.pid, sig)
+    except ProcessLookupError:  # whole group already exited
+        pass
+
+
+async def with_proc(
+    act: Callable[[Process], Awaitable[T]],
+    *args: StrOrBytesPath,
+    stdin: int | None = DEVNULL,
+    stdout: int | None = DEVNULL,
+) -> T:
+    # own process group, so it and its children are only stopped by us
+    p = await create_subprocess_exec(*args, stdin=stdin, stdout=stdout, process_group=0)
+    try:
+        ret = await act(p)
+    except BaseException:  # including cancellation
+        signal_group(p, SIGTERM)
+        try:
+            await asyncio.wait_for(p.wait(), TERMINATE_TIMEOUT)
+        except TimeoutError:
+            signal_group(p, SIGKILL)
+            await p.wait()
+        raise
+    assert p.returncode is not None
+
+    if p.returncode != 0:
+        raise CalledProcessError(p.returncode, args)
+
+    return ret
+
+
+async def run(*args: StrOrBytesPath) -> None:
+    await with_proc(lambda p: p.wait(), *args)
+
+
+def to_bytes(doc: OpenDocument) -> bytes:
+    buffer = BytesIO()
+    doc.write(buffer)
+    return buffer.getvalue()
+
+
+# return false when every page is empty
+def drop_empty_pages(src: Path | IO[bytes], dst: Path | IO[bytes]) -> bool:
+    reader = PdfReader(src)
+    writer = PdfWriter()
+
+    for page in reader.pages:
+        if len(page.extract_text().strip()) >= 3:  # not quite empty
+            writer.add_page(page)
+
+    if len(writer.pages) == 0:
+        return False
+
+    writer.write(dst)
+    return True
+
+
+def get_unused_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port: int = sock.getsockname()[1]
+        return port
+
+
+# spawn unoserver on first use, kept running until exit
+@cache
+def get_uno_client() -> "UnoClient":
+    from unoserver.client import UnoClient
+
+    # not the default ports, which a user's soffice may already listen on
+    port = get_unused_port()
+    args = [
+        "unoserver",
+        "--port",
+        str(port),
+        "--uno-port",
+        str(get_unused_port()),
+    ]
+    daemon = Popen(args, stdin=DEVNULL, stdout=DEVNULL)
+    atexit.register(daemon.terminate)
+
+    deadline = time.monotonic() + UNOSERVER_START_TIMEOUT
+    while True:
+        try:
+            socket.create_connection(("127.0.0.1", port)).close()
+            break
+        except OSError:  # not ready yet
+            if daemon.poll() is not None:
+                raise CalledProcessError(daemon.returncode, args)
+            if time.monotonic() > deadline:
+                daemon.terminate()
+                raise TimeoutError("unoserver did not start in time")
+            time.sleep(0.1)
+
+    return UnoClient(port=str(port))
+
+
+def convert_with_unoserver(odt: bytes) -> bytes:
+    pdf: bytes = get_uno_client().convert(indata=odt, convert_to="pdf")
+    return pdf
+
+
+# return none when unable to reach the server
+def convert_with_uno(odt: bytes, server: str) -> bytes | None:
+    try:
+        import uno
+        import unohelper
+        from com.sun.star.beans import PropertyValue
+        from com.sun.star.connection import NoConnectException
+        from com.sun.star.io import XOutputStream
+    except ImportError:
+        print(
+            "warning: uno module not found, run with LibreOffice's python"
+            " to use --server, falling back to spawning libreoffice",
+            file=sys.stderr,
+        )
+        return None
+
+    class OutputStream(unohelper.Base, XOutputStream):  # type: ignore[misc]
+        def __init__(self) -> None:
+            self.buffer = BytesIO()
+
+        def writeBytes(self, seq: Any) -> None:
+            self.buffer.write(seq.value)
+
+        def flush(self) -> None:
+            pass
+
+        def closeOutput(self) -> None:
+            pass
+
+    local = uno.getComponentContext()
+    resolver = local.ServiceManager.createInstanceWithContext(
+        "com.sun.star.bridge.UnoUrlResolver", local
+    )
+    try:
+        ctx = resolver.resolve(f"uno:{server};urp;StarOffice.ComponentContext")
+    except NoConnectException:
+        print(
+            f"warning: unable to connect to {server},"
+            " falling back to spawning libreoffice",
+            file=sys.stderr,
+        )
+        return None
+    smgr = ctx.ServiceManager
+
+    desktop = smgr.createInstanceWithContext("com.sun.star.frame.Desktop", ctx)
+    stream = smgr.createInstanceWithContext("com.sun.star.io.SequenceInputStream", ctx)
+    stream.initialize((uno.ByteSequence(odt),))
+
+    document = desktop.loadComponentFromURL(
+        "private:stream",
+        "_blank",
+        0,
+        (
+            PropertyValue(Name="InputStream", Value=stream),
+            PropertyValue(Name="Hidden", Value=True),
+        ),
+    )
+    if document is None:
+        raise UnableToLoadDocument(server)
+    output = OutputStream()
+    try:
+        document.storeToURL(
+            "private:stream",
+            (
+                PropertyValue(Name="FilterName", Value="writer_pdf_Export"),
+                PropertyValue(Name="OutputStream", Value=output),
+            ),
+        )
+    finally:
+        document.close(True)
+
+    return output.buffer.getvalue()
+
+
+async def write_without_empty_pages(pdf: bytes, out: IO[bytes]) -> None:
+    src = BytesIO(pdf)
+    kept = BytesIO()
+
+    if not await asyncio.get_running_loop().run_in_executor(
+        None, drop_empty_pages, src, kept
+    ):
+        # whole empty pdf, keep base one
+        kept = src
+
+    out.write(kept.getvalue())
+
+
+async def pdf_convert_libreoffice(
+    doc: OpenDocument, out: IO[bytes], server: str | None = None
+) -> None:
+    loop = asyncio.get_running_loop()
+
+    if server is not None:
+        pdf = await loop.run_in_executor(None, convert_with_uno, to_bytes(doc), server)
+        if pdf is not None:
+            await write_without_empty_pages(pdf, out)
+            return
+        # else fallback to a one-shot libreoffice
+
+    if environ.get("CV_UNO_DAEMON") == "1":
+        pdf = await loop.run_in_executor(None, convert_with_unoserver, to_bytes(doc))
+        await write_without_empty_pages(pdf, out)
+        return
+
+    # keep the intermediate files in memory when possible
+    tmp_root = SHM_PATH if SHM_PATH.is_dir() else None
+    with TemporaryDirectory(dir=tmp_root) as tmpdir:
+        odt_path = Path(tmpdir) / "cv_dirty.odt"
+        out_path = Path(tmpdir) / "cv.pdf"
+        pdf_path = odt_path.with_suffix(".pdf")
+
+        doc.write(odt_path)
+
+        await run(
+            "libreoffice",
+            "--convert-to",
+            "pdf",
+            "--outdir",
+            pdf_path.parent,
+            odt_path,
+        )
+        if not await loop.run_in_executor(None, drop_empty_pages, pdf_path, out_path):
+            # whole empty pdf, copy base one
+            pdf_path.rename(out_path)
+
+        with out_path.open("rb") as f:
+            copyfileobj(f, out, length=1024 * 1024)
+        out.flush()
+
+
+async def pdf_convert_pandoc(doc: OpenDocument, out: IO[bytes]) -> None:
+    loop = asyncio.get_running_loop()
+    read_fd, write_fd = pipe()
+
+    # stream directly to pandoc, without building the whole odt in memory
+    with open(read_fd, "rb") as read_end, open(write_fd, "wb") as write_end:
+
+        async def send_doc(p: Process) -> None:
+            read_end.close()  # only pandoc reads now, so writes fail if it exits
+
+            def write() -> None:
+                with write_end:
+                    doc.write(write_end)
+
+            async def send() -> None:
+                try:
+                    await loop.run_in_executor(None, write)
+                except BrokenPipeError:
+                    pass  # pandoc exited early, its return code tells why
+
+            # copy pandoc's output ourselves, as out may not have a file descriptor
+            async def receive() -> None:
+                assert p.stdout is not None
+                while chunk := await p.stdout.read(1024 * 1024):
+                    out.write(chunk)
+
+            try:
+                async with asyncio.TaskGroup() as tg:
+                    tg.create_task(send())
+                    tg.create_task(receive())
+            except ExceptionGroup as e:
+                raise e.exceptions[0]
+
+            await p.wait()
+            out.flush()
+
+        await with_proc(
+            send_doc,
+            "pandoc",
+            "--from=odt",
+            "--to=pdf",
+            stdin=read_end.fileno(),
+            stdout=PIPE,
+        )
+
+
+def detect_backend() -> Backend:
+    from shutil import which
+
+    if which("libreoffice") is not None:
+        return "libreoffice"
+    elif which("pandoc") is not None:
+        return "pandoc"
+    else:
+        raise UnableToAutoDetectBackend()
+
+
+async def pdf_convert(
+    backend: Backend | None,
+    doc: OpenDocument,
+    out: IO[bytes],
+    server: str | None = None,
+) -> None:
+    if backend is None:
+        backend = detect_backend()
+
+    if backend == "libreoffice":
+        await pdf_convert_libreoffice(doc, out, server)
+    elif backend == "pandoc":
+        await pdf_convert_pandoc(doc, out)
@@ -4,50 +4,51 @@ from odf.opendocument import OpenDocument
 from odf.style import ParagraphProperties, Style, TableColumnProperties, TextProperties
 
 
-paragraph_styles = {
+# plain attributes, as odfpy moves an element when added to another document
+paragraph_styles: dict[str, tuple[dict[str, str], dict[str, str]]] = {
     "Title": (
-        TextProperties(
+        dict(
             fontfamily="DejaVu Sans",
             fontsize="28pt",
             color="#000000",
             fontweight="bold",
         ),
-        ParagraphProperties(
+        dict(
             marginbottom="0.08in",
         ),
     ),
     "Subtitle": (
-        TextProperties(
+        dict(
             fontfamily="DejaVu Sans Light",
             fontsize="11pt",
             color="#666666",
             fontweight="bold",
             letterspacing="0.015in",
         ),
-        ParagraphProperties(
+        dict(
             marginleft="0.08in",
             marginright="0.08in",
             marginbottom="0.08in",
         ),
     ),
     "Urls": (
-        TextProperties(
+        dict(
             fontfamily="DejaVu Sans",
             fontsize="10pt",
             color="#999999",
         ),
-        ParagraphProperties(
+        dict(
             margintop="0.05in",
             marginbottom="0.05in",
         ),
     ),
     "Table header": (
-        TextProperties(
+        dict(
             fontfamily="DejaVu Sans",
             fontsize="10pt",
             color="#4c4c4c",
         ),
-        ParagraphProperties(
+        dict(
             padding="0.05in",
             borderbottom="0.06pt solid #000000",
             marginleft="0.05in",
@@ -57,12 +58,12 @@ paragraph_styles = {
         ),
     ),
     "Table key": (
-        TextProperties(
+        dict(
             fontfamily="DejaVu Sans",
             fontsize="10pt",
             color="#999999",
         ),
-        ParagraphProperties(
+        dict(
             marginleft="0.05in",
             marginright="0.05in",
             margintop="0.05in",
@@ -71,12 +72,12 @@ paragraph_styles = {
         ),
     ),
     "Table value": (
-        TextProperties(
+        dict(
             fontfamily="DejaVu Sans",
             fontsize="10pt",
             color="#000000",
         ),
-        ParagraphProperties(
+        dict(
             marginleft="0.05in",
             marginright="0.05in",
             margintop="0.05in",
@@ -84,13 +85,13 @@ paragraph_styles = {
         ),
     ),
     "Table value bold": (
-        TextProperties(
+        dict(
             fontfamily="DejaVu Sans",
             fontsize="10pt",
             color="#000000",
             fontweight="bold",
         ),
-        ParagraphProperties(
+        dict(
             marginleft="0.05in",
             marginright="0.05in",
             margintop="0.05in",
@@ -99,26 +100,26 @@ paragraph_styles = {
     ),
 }
 
-tablecolumn_styles = {
-    "Table title": TableColumnProperties(relcolumnwidth="2000*"),
-    "Table urls": TableColumnProperties(relcolumnwidth="1000*"),
-    "Table column key": TableColumnProperties(relcolumnwidth="1000*"),
-    "Table column value": TableColumnProperties(relcolumnwidth="4000*"),
+tablecolumn_styles: dict[str, dict[str, str]] = {
+    "Table title": dict(relcolumnwidth="2000*"),
+    "Table urls": dict(relcolumnwidth="1000*"),
+    "Table column key": dict(relcolumnwidth="1000*"),
+    "Table column value": dict(relcolumnwidth="4000*"),
 }
 
 
 def gen_styles() -> Iterable[Element]:
     for name, (font, para) in paragraph_styles.items():
         s = Style(name=name, family="paragraph")
-        s.addElement(font)
-        s.addElement(para)
+        s.addElement(TextProperties(**font))
+        s.addElement(ParagraphProperties(**para))
         yield s
 
 
 def gen_auto_styles() -> Iterable[Element]:
     for name, props in tablecolumn_styles.items():
         s = Style(name=name, family="table-column")
-        s.addElement(props)
+        s.addElement(TableColumnProperties(**props))
         yield s
 
     bold = Style(name="Bold", family="text")
@@ -135,3 +136,13 @@ def add_styles(doc: OpenDocument) -> None:
         doc.styles.addElement(s)
     for s in gen_auto_styles():
         doc.automaticstyles.addElement(s)
+
+    doc._style_cache = {
+        name: doc.getStyleByName(name)
+        for name in [*paragraph_styles, *tablecolumn_styles, "Bold"]
+    }
+
+
+def get_style(doc: OpenDocument, name: str) -> Element:
+    style: Element = doc._style_cache[name]
+    return style
@@ -1,4 +1,6 @@
-from subprocess import DEVNULL, check_call
+from pathlib import Path
+from subprocess import DEVNULL, check_call, check_output, run
+from tempfile import TemporaryDirectory
 
 import unittest
 
@@ -12,3 +14,29 @@ class CLITestCase(unittest.TestCase):
             check_call(
                 ["cv", "pdf", "--backend", backend], stdin=DEVNULL, stdout=DEVNULL
             )
+
+    def test_cache_reused(self) -> None:
+        with TemporaryDirectory() as cache_dir:
+            args = ["cv", "--cache-dir", cache_dir, "odt"]
+            generated = check_output(args, input=b'title = "cached"')
+
+            (cached,) = Path(cache_dir).iterdir()
+            self.assertEqual(cached.read_bytes(), generated)
+
+            # served from the cache, not generated again
+            cached.write_bytes(b"from cache")
+            self.assertEqual(
+                check_output(args, input=b'title = "cached"'), b"from cache"
+            )
+
+    def test_cache_failed_generation(self) -> None:
+        with TemporaryDirectory() as cache_dir:
+            ret = run(
+                ["cv", "--cache-dir", cache_dir, "odt"],
+                input=b"invalid = 1",
+                stdout=DEVNULL,
+                stderr=DEVNULL,
+            )
+
+            self.assertNotEqual(ret.returncode, 0)
+            self.assertEqual(list(Path(cache_dir).iterdir()), [])
@@ -0,0 +1,19 @@
+import tomlkit
+import unittest
+
+from curriculum_vitae import generate
+from curriculum_vitae.generate import UnexpectedBlockType
+
+
+class GenerateTestCase(unittest.TestCase):
+    def test_styles_kept_across_documents(self) -> None:
+        first = generate(tomlkit.parse('title = "first"'))
+        generate(tomlkit.parse('title = "second"'))
+
+        self.assertIn('fo:font-size="28pt"', first.stylesxml())
+
+    def test_reject_non_str_values(self) -> None:
+        for config in ["a = 1", "a = { b = 1 }", "a = { _ = [1, { x = 1 }] }"]:
+            with self.subTest(config=config):
+                with self.assertRaises(UnexpectedBlockType):
+                    generate(tomlkit.parse(config))